@@ -1,6 +1,11 @@
+import altair as alt
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+import pandas as pd
+from matplotlib.figure import Figure
+
+from grace_utils import (N60, DAYS30, X_FRONT, FIG10_CURVES, FIG10_COEFS, figure_rng,
+                         random_constellations, geoid_error, plot_degree_curves, render_png)
 
 st.set_page_config(page_title="GRACE Constellation Optimization", layout="wide")
 
@@ -23,109 +28,123 @@ generations = st.sidebar.slider("Generations", 5, 50, 20)
 run_sim = st.sidebar.button("🚀 Run Simulation")
 
 # ---------------------------
-# Helper functions
-# ---------------------------
-def random_constellations(num, gen):
-    Jso = np.random.rand(num) / gen**0.5 + 0.02
-    Jto = np.random.rand(num) / gen**0.5 + 0.02
-    return Jso, Jto
-
-def geoid_error(n):
-    np.random.seed(42)
-    signal = 1e-4 / (np.arange(1, n+1)**2)
-    error = signal + np.random.normal(0, 0.2*signal, n)
-    return signal, error
-
+# Figures
 # ---------------------------
-# Output visualization
-# ---------------------------
-st.title("🛰️ Multiobjective GA Optimization for GRACE-like Constellations")
-st.markdown(
-    "This dashboard simulates the optimization of GRACE-type satellite constellations using a Multiobjective Genetic Algorithm (NSGA-II)."
-)
-
-if run_sim:
-    st.success("Simulation running...")
-
-    # ----- FIG 8 -----
-    fig8, ax8 = plt.subplots()
-    for gen in [1, 3, generations]:
-        Jso, Jto = random_constellations(population_size, gen)
-        ax8.scatter(Jso, Jto, label=f'Generation {gen}', alpha=0.6)
-    ax8.set_xlabel("Spatial Objective (Jso)")
-    ax8.set_ylabel("Temporal Objective (Jto)")
-    ax8.set_title("Figure 8. Constellation population for generations 1, 3, and 20")
-    ax8.legend()
-    st.pyplot(fig8)
-
-    # ----- FIG 9 -----
-    fig9, ax9 = plt.subplots()
-    for pareto in [1, 10, 48, 98]:
-        x = np.linspace(0.02, 0.3, 50)
-        y = 0.3 - x + np.random.rand(50) * 0.05 / pareto
-        ax9.plot(x, y, label=f"Pareto {pareto}")
-    ax9.set_xlabel("Jso")
-    ax9.set_ylabel("Jto")
-    ax9.set_title("Figure 9. Pareto fronts spanning search space")
-    ax9.legend()
-    st.pyplot(fig9)
-
-    # ----- FIG 10 -----
-    fig10, ax10 = plt.subplots()
-    n = np.arange(1, 61)
-    truth, est = geoid_error(60)
-    ax10.plot(n, truth, 'k--', label="Truth signal")
-    for curve in [1, 10, 48]:
-        noise = est * (1 + np.log10(curve) * 0.1)
-        ax10.plot(n, noise, label=f"Pareto {curve}")
+# ----- FIG 8 -----
+@st.cache_data(max_entries=8)
+def make_fig8(population_size, generations):
+    gens = [1, 3, generations]
+    samples = random_constellations(figure_rng(8), population_size, gens)
+    frames = []
+    for gen, (Jso, Jto) in zip(gens, samples):
+        frames.append(pd.DataFrame({"Jso": Jso, "Jto": Jto, "Generation": f"Generation {gen:02}"}))
+    return pd.concat(frames, ignore_index=True)
+
+# ----- FIG 9 -----
+@st.cache_data(max_entries=8)
+def make_fig9():
+    paretos = np.array([1, 10, 48, 98])
+    spread = (0.05 / paretos).astype(np.float32)
+    noise = figure_rng(9).random((paretos.size, X_FRONT.size), dtype=np.float32)
+    fronts = 0.3 - X_FRONT + noise * spread[:, None]
+    return pd.DataFrame(fronts.T, index=pd.Index(X_FRONT, name="Jso"),
+                        columns=[f"Pareto {pareto}" for pareto in paretos])
+
+# ----- FIG 10 -----
+@st.cache_data(max_entries=8)
+def make_fig10():
+    fig10 = Figure()
+    ax10 = fig10.subplots()
+    truth, est = geoid_error(N60.size)
+    ax10.plot(N60, truth, 'k--', label="Truth signal")
+    noises = est[None, :] * FIG10_COEFS[:, None]
+    for curve, noise in zip(FIG10_CURVES, noises):
+        ax10.plot(N60, noise, label=f"Pareto {curve}")
     ax10.set_yscale("log")
     ax10.set_xlabel("Degree (n)")
     ax10.set_ylabel("Error (ΔNₙ)")
     ax10.set_title("Figure 10. Average degree variances for Pareto curves")
     ax10.legend()
-    st.pyplot(fig10)
-
-    # ----- FIG 11 -----
-    fig11, ax11 = plt.subplots()
-    constellations = np.random.rand(10, 2)
-    ax11.scatter(constellations[:, 0], constellations[:, 1], c='blue', s=100)
-    for i in range(10):
-        ax11.text(constellations[i, 0], constellations[i, 1], f"c{i+1}", fontsize=9)
-    ax11.set_xlabel("Jso")
-    ax11.set_ylabel("Jto")
-    ax11.set_title("Figure 11. Family of ten six-pair constellations")
-    st.pyplot(fig11)
-
-    # ----- FIG 12 -----
-    fig12, ax12 = plt.subplots()
-    for i in range(1, 11):
-        ax12.plot(np.arange(1, 61), np.random.rand(60) * 1e-4, label=f"c{i:02}")
-    ax12.set_yscale("log")
+    return render_png(fig10)
+
+# ----- FIG 11 -----
+@st.cache_data(max_entries=8)
+def make_fig11():
+    constellations = figure_rng(11).random((10, 2), dtype=np.float32)
+    return pd.DataFrame({"Jso": constellations[:, 0], "Jto": constellations[:, 1],
+                         "Constellation": [f"c{i+1:02}" for i in range(10)]})
+
+# ----- FIG 12 -----
+@st.cache_data(max_entries=8)
+def make_fig12():
+    fig12 = Figure()
+    ax12 = fig12.subplots()
+    variances = figure_rng(12).random((10, N60.size), dtype=np.float32) * 1e-4
+    plot_degree_curves(ax12, variances)
     ax12.set_xlabel("Degree")
     ax12.set_ylabel("Error")
     ax12.set_title("Figure 12. 1-day average degree variances (c01–c10)")
-    ax12.legend(ncol=2)
-    st.pyplot(fig12)
-
-    # ----- FIG 13 -----
-    fig13, ax13 = plt.subplots()
-    days = np.arange(1, 31)
-    ax13.plot(days, np.random.rand(30)*1e-4)
+    return render_png(fig12)
+
+# ----- FIG 13 -----
+@st.cache_data(max_entries=8)
+def make_fig13():
+    fig13 = Figure()
+    ax13 = fig13.subplots()
+    ax13.plot(DAYS30, figure_rng(13).random(DAYS30.size, dtype=np.float32)*1e-4)
     ax13.set_xlabel("Day")
     ax13.set_ylabel("Degree Variance")
     ax13.set_title("Figure 13. 1-day variances for constellation c06 (Jan 2003)")
-    st.pyplot(fig13)
-
-    # ----- FIG 14 -----
-    fig14, ax14 = plt.subplots()
-    for i in range(1, 11):
-        ax14.plot(np.arange(1, 61), np.random.rand(60)*1e-4, label=f"c{i:02}")
-    ax14.set_yscale("log")
+    return render_png(fig13)
+
+# ----- FIG 14 -----
+@st.cache_data(max_entries=8)
+def make_fig14():
+    fig14 = Figure()
+    ax14 = fig14.subplots()
+    variances = figure_rng(14).random((10, N60.size), dtype=np.float32) * 1e-4
+    plot_degree_curves(ax14, variances)
     ax14.set_xlabel("Degree")
     ax14.set_ylabel("Error")
     ax14.set_title("Figure 14. 29-day average degree variances (c01–c10)")
-    ax14.legend(ncol=2)
-    st.pyplot(fig14)
+    return render_png(fig14)
+
+# ---------------------------
+# Output visualization
+# ---------------------------
+st.title("🛰️ Multiobjective GA Optimization for GRACE-like Constellations")
+st.markdown(
+    "This dashboard simulates the optimization of GRACE-type satellite constellations using a Multiobjective Genetic Algorithm (NSGA-II)."
+)
+
+if run_sim:
+    st.success("Simulation running...")
+
+    # Builders run in order on the main thread. After the first run each is a st.cache_data
+    # hit, and Agg rasterization holds the GIL, so a thread pool would mostly add start-up cost.
+    figs = {
+        8: make_fig8(population_size, generations),
+        9: make_fig9(),
+        10: make_fig10(),
+        11: make_fig11(),
+        12: make_fig12(),
+        13: make_fig13(),
+        14: make_fig14(),
+    }
+
+    st.markdown(f"**Figure 8. Constellation population for generations 1, 3, and {generations}**")
+    st.scatter_chart(figs[8], x="Jso", y="Jto", color="Generation",
+                     x_label="Spatial Objective (Jso)", y_label="Temporal Objective (Jto)")
+    st.markdown("**Figure 9. Pareto fronts spanning search space**")
+    st.line_chart(figs[9], x_label="Jso", y_label="Jto")
+    st.image(figs[10], width="stretch")
+    st.markdown("**Figure 11. Family of ten six-pair constellations**")
+    # Points plus a text layer, so each constellation is labelled in place, not only in the legend
+    points = alt.Chart(figs[11]).mark_circle(size=100).encode(x="Jso", y="Jto", color="Constellation")
+    st.altair_chart(points + points.mark_text(align="left", dx=8).encode(text="Constellation"))
+    st.image(figs[12], width="stretch")
+    st.image(figs[13], width="stretch")
+    st.image(figs[14], width="stretch")
 
 else:
     st.warning("Adjust parameters in the sidebar and click **Run Simulation** to generate results.")
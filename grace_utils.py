@@ -0,0 +1,85 @@
+# Streamlit re-executes app.py on every rerun but imports this module only once,
+# so module-scope state (lru_cache'd results, JIT-compiled kernels) lives
+# here to persist across reruns. Do not move such caches back into the script body.
+from functools import lru_cache
+from io import BytesIO
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+SEED = 42
+
+# Shared abscissae, read-only so no figure can modify another's axis data
+N60 = np.arange(1, 61, dtype=np.float32)
+N60.setflags(write=False)
+DAYS30 = np.arange(1, 31, dtype=np.float32)
+DAYS30.setflags(write=False)
+X_FRONT = np.linspace(0.02, 0.3, 50, dtype=np.float32)
+X_FRONT.setflags(write=False)
+
+# Fig 10 Pareto curves and their log10 error scaling
+FIG10_CURVES = (1, 10, 48)
+FIG10_COEFS = 1 + 0.1*np.log10(np.array(FIG10_CURVES, dtype=np.float32))
+FIG10_COEFS.setflags(write=False)
+
+# ---------------------------
+# Helper functions
+# ---------------------------
+def figure_rng(fig_id):
+    # Independent stream per figure, so each figure's data does not depend on
+    # which other figures were drawn before it
+    return np.random.default_rng([SEED, fig_id])
+
+def random_constellations(rng, num, gens):
+    # (len(gens), 2, num) array of (Jso, Jto) samples, one batched draw for all generations
+    scale = (1 / np.sqrt(np.asarray(gens, dtype=np.float32)))[:, None, None]
+    return rng.random((len(gens), 2, num), dtype=np.float32) * scale + np.float32(0.02)
+
+def _geoid_kernel(n, noise):
+    signal = (np.float32(1e-4) / (np.arange(1, n+1).astype(np.float32)**2)).astype(np.float32)
+    error = (signal + np.float32(0.2)*signal*noise).astype(np.float32)
+    return signal, error
+
+if HAS_NUMBA:
+    _geoid_kernel = njit(cache=True)(_geoid_kernel)
+
+def _geoid_error(n, seed):
+    # Noise is drawn outside the kernel so the Numba and NumPy paths give identical values
+    noise = np.random.default_rng(seed).standard_normal(n, dtype=np.float32)
+    return _geoid_kernel(n, noise)
+
+@lru_cache(maxsize=None)
+def geoid_error(n):
+    signal, error = _geoid_error(n, SEED)
+    # Cached arrays are shared between reruns, so keep them read-only
+    signal.setflags(write=False)
+    error.setflags(write=False)
+    return signal, error
+
+# Legend proxies for the ten constellations c01–c10, built once and shared by Figs 12 and 14
+_CURVE_COLORS = [f"C{i}" for i in range(10)]
+_CURVE_HANDLES = [Line2D([], [], color=color, label=f"c{i:02}") for i, color in enumerate(_CURVE_COLORS, 1)]
+
+def plot_degree_curves(ax, variances):
+    # All curves go into one LineCollection; the legend uses the prebuilt proxies
+    degrees = np.broadcast_to(N60, variances.shape)
+    ax.add_collection(LineCollection(np.stack([degrees, variances], axis=-1), colors=_CURVE_COLORS))
+    ax.set_yscale("log")
+    ax.autoscale()
+    # A fixed location skips the overlap search that loc='best' runs over the data. On the
+    # log axis the uniform samples crowd the top of the plot, so the legend goes bottom right.
+    ax.legend(handles=_CURVE_HANDLES, ncol=2, loc="lower right")
+
+def render_png(fig):
+    # Same savefig settings st.pyplot used. The PNG is encoded once per cache miss, and
+    # the cached bytes are passed through by st.image without re-encoding.
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+    return buf.getvalue()